@@ -22,6 +22,9 @@ from solana.rpc.types import TxOpts
 import solana.exceptions
 import base64
 import traceback
+import math
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 
 from solders.transaction import VersionedTransaction
@@ -67,6 +70,22 @@ solana_client = Client(RPC_ENDPOINT)
 SOL_MINT = "So11111111111111111111111111111111111111112"
 USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
 LAMPORTS_PER_SOL = 1_000_000_000
+MINT_SYMBOLS = {SOL_MINT: "SOL", USDC_MINT: "USDC"}
+
+# --- Execution Settings ---
+IMPACT_PROBE_FRACTIONS = (0.125, 0.25, 0.5)  # Probe sizes as fractions of the order, quoted alongside the full size
+MAX_SLICES = 8
+SLICE_INTERVAL_SECONDS = 15
+SLICE_OVERHEAD_BPS = 1.0  # Estimated cost per extra slice (fees + price drift while waiting)
+MIN_SLICE_SAVINGS_BPS = 2.0  # Only slice when it beats a single swap by at least this much
+MIN_SLICE_AMOUNTS = {SOL_MINT: 10_000_000, USDC_MINT: 1_000_000}  # 0.01 SOL / 1 USDC
+REVERSE_SWAP_USDC_AMOUNT = 10  # Fallback USD value when no USDC fill has been recorded
+
+# --- UI Settings ---
+UI_FRAME_MS = 50  # Tk drains queued engine events at most this often (~20 fps)
+UI_QUEUE_SIZE = 1000  # Oldest events are dropped when the GUI falls behind; trading never waits
+UI_MAX_BATCH = 200
+UI_MAX_LOG_LINES = 2000
 
 
 # --- Logging Setup ---
@@ -126,13 +145,28 @@ buy_price = 0
 stop_loss_price = 0
 take_profit_price = 0
 swap_in_progress = False
+usdc_holdings = 0  # USDC base units received by the last SOL → USDC swap
 
-# Initialize pygame mixer
+# Initialize pygame mixer and preload alert sounds onto a reserved channel
+alert_sounds = {}
+alert_channel = None
 try:
     pygame.mixer.init()
+    pygame.mixer.set_reserved(1)
+    alert_channel = pygame.mixer.Channel(0)
+    for file_name in sound_files:
+        if file_name in missing_sounds:
+            continue
+        try:
+            alert_sounds[file_name] = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), file_name))
+        except Exception as e:
+            logger.warning(f"Failed to preload sound {file_name}: {e}")
 except Exception as e:
     logger.warning(f"Pygame mixer initialization failed: {e}. Sound alerts disabled.")
 
+# Engine -> GUI events, drained by the Tk loop in drain_ui_events
+ui_events = queue.Queue(maxsize=UI_QUEUE_SIZE)
+
 # Telegram Bot
 try:
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
@@ -229,23 +263,68 @@ def fetch_current_price(max_attempts=3, backoff_factor=2):
             time.sleep(backoff_factor ** attempt)
     return None
 
-def log(message):
-    logger.info(message)
-    def append_log():
+def post_ui_event(kind, payload):
+    # Never block the caller: if the GUI is behind, drop the oldest event instead
+    while True:
         try:
-            log_output.insert(tk.END, f"{datetime.now().strftime('%H:%M:%S')} - {message}\n")
+            ui_events.put_nowait((kind, payload))
+            return
+        except queue.Full:
+            try:
+                ui_events.get_nowait()
+            except queue.Empty:
+                pass
+
+def drain_ui_events():
+    lines = []
+    new_prices = []
+    balance_event = None
+    try:
+        for _ in range(UI_MAX_BATCH):
+            kind, payload = ui_events.get_nowait()
+            if kind == "log":
+                lines.append(payload)
+            elif kind == "price":
+                new_prices.append(payload)
+            elif kind == "balance":
+                balance_event = payload
+    except queue.Empty:
+        pass
+
+    try:
+        if lines:
+            log_output.insert(tk.END, "".join(lines))
+            excess = int(log_output.index('end-1c').split('.')[0]) - UI_MAX_LOG_LINES
+            if excess > 0:
+                log_output.delete('1.0', f"{excess + 1}.0")
             log_output.yview_moveto(1.0)
+        if balance_event is not None:
+            sol_balance, = balance_event
+            wallet_balance.set(f"SOL Balance: {sol_balance:.4f}" if sol_balance is not None else "SOL Balance: Error")
+        if new_prices:
+            redraw_price_chart(new_prices)
+    except tk.TclError:
+        pass
+    except Exception as e:
+        logger.error(f"UI update error: {e}\nTraceback: {traceback.format_exc()}")
+    finally:
+        # Keep draining until the window is gone, so one bad update never stalls the GUI
+        try:
+            if root.winfo_exists():
+                root.after(UI_FRAME_MS, drain_ui_events)
         except tk.TclError:
             pass
-    root.after(0, append_log)
+
+def log(message):
+    logger.info(message)
+    post_ui_event("log", f"{datetime.now().strftime('%H:%M:%S')} - {message}\n")
 
 def play_sound(file_name):
-    if file_name in missing_sounds:
+    sound = alert_sounds.get(file_name)
+    if sound is None or alert_channel is None:
         return
     try:
-        sound_path = os.path.join(os.path.dirname(__file__), file_name)
-        pygame.mixer.music.load(sound_path)
-        pygame.mixer.music.play()
+        alert_channel.play(sound)
     except Exception as e:
         logger.error(f"Sound playback error: {e}")
 
@@ -305,45 +384,35 @@ def reset_trade():
     play_sound("reset_bot.mp3")
 
 def update_price_chart(current_price):
-    prices.append(current_price)
-    timestamps.append(datetime.now())
-    if len(prices) > 100:
-        prices.pop(0)
-        timestamps.pop(0)
-    def update():
-        try:
-            ax.clear()
-            ax.plot(timestamps, prices, label='SOL Price', color='#4CAF50')
-            ax.set_xlabel('Time')
-            ax.set_ylabel('Price (USD)')
-            ax.legend()
-            ax.tick_params(axis='x', rotation=45)
-            ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%H:%M:%S'))
-            canvas.draw()
-        except tk.TclError:
-            pass
-    root.after(0, update)
+    post_ui_event("price", (datetime.now(), current_price))
+
+def redraw_price_chart(new_prices):
+    for timestamp, price in new_prices:
+        timestamps.append(timestamp)
+        prices.append(price)
+    del timestamps[:-100]
+    del prices[:-100]
+    ax.clear()
+    ax.plot(timestamps, prices, label='SOL Price', color='#4CAF50')
+    ax.set_xlabel('Time')
+    ax.set_ylabel('Price (USD)')
+    ax.legend()
+    ax.tick_params(axis='x', rotation=45)
+    ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%H:%M:%S'))
+    canvas.draw_idle()
 
 def update_wallet_display():
     sol_balance = fetch_wallet_balance()
-    def set_balance():
-        try:
-            if sol_balance is not None:
-                wallet_balance.set(f"SOL Balance: {sol_balance:.4f}")
-            else:
-                wallet_balance.set("SOL Balance: Error")
-        except tk.TclError:
-            pass
-    root.after(0, set_balance)
+    post_ui_event("balance", (sol_balance,))
 
-def get_jupiter_quote(amount_lamports, max_attempts=3, backoff_factor=2):
+def get_jupiter_quote(amount, input_mint=SOL_MINT, output_mint=USDC_MINT, max_attempts=3, backoff_factor=2, log_quote=True):
     for attempt in range(max_attempts):
         try:
             url = 'https://quote-api.jup.ag/v6/quote'
             params = {
-                'inputMint': 'So11111111111111111111111111111111111111112',
-                'outputMint': 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v',
-                'amount': str(amount_lamports),
+                'inputMint': input_mint,
+                'outputMint': output_mint,
+                'amount': str(amount),
                 'slippageBps': '50',
                 'asLegacyRoute': 'true',
                 'onlyDirectRoutes': 'false'
@@ -352,7 +421,8 @@ def get_jupiter_quote(amount_lamports, max_attempts=3, backoff_factor=2):
             response.raise_for_status()
             data = response.json()
             if 'outAmount' in data and 'routePlan' in data:
-                log(f"Quote received: {data}")
+                if log_quote:
+                    log(f"Quote received: {data}")
                 return data
             log(f"Invalid quote response: {data}")
             return None
@@ -426,149 +496,237 @@ def get_latest_blockhash_with_retry(max_attempts=3, backoff_factor=2):
 
 
 
-def execute_swap(quote_response, wallet, solana_client):
-    global current_asset, swap_in_progress
-    if swap_in_progress:
-        log("Swap already in progress. Skipping.")
-        return
-
-    swap_in_progress = True
+def parse_price_impact_bps(quote):
+    # Jupiter reports priceImpactPct as a fraction string, e.g. '0.0012' for 0.12%
     try:
-        log("Preparing Jupiter swap...")
-
-        # Step 1: Get swap transaction from Jupiter
-        payload = {
-            "quoteResponse": quote_response,
-            "userPublicKey": str(wallet.pubkey()),
-            "wrapAndUnwrapSol": True,
-            "asLegacyTransaction": True
-        }
-
-        swap_resp = requests.post("https://quote-api.jup.ag/v6/swap", json=payload)
-        swap_resp.raise_for_status()
-        swap_data = swap_resp.json()
+        return abs(float(quote.get('priceImpactPct') or 0)) * 10_000
+    except (TypeError, ValueError):
+        return 0.0
+
+def probe_price_impact(amount, input_mint, output_mint):
+    sizes = sorted({max(1, int(amount * fraction)) for fraction in IMPACT_PROBE_FRACTIONS} | {amount})
+    with ThreadPoolExecutor(max_workers=len(sizes)) as pool:
+        quotes = list(pool.map(lambda size: get_jupiter_quote(size, input_mint, output_mint, log_quote=False), sizes))
+    samples = [(size, parse_price_impact_bps(quote), quote) for size, quote in zip(sizes, quotes) if quote]
+    for size, impact_bps, quote in samples:
+        log(f"Impact probe: {size} {MINT_SYMBOLS.get(input_mint, input_mint)} -> {quote['outAmount']} {MINT_SYMBOLS.get(output_mint, output_mint)}, impact {impact_bps:.2f} bps")
+    return samples
+
+def fit_price_impact_curve(samples):
+    """Fit impact_bps = k * amount ** alpha to probe samples; returns (k, alpha)."""
+    points = [(math.log(size), math.log(impact_bps)) for size, impact_bps, _ in samples if size > 0 and impact_bps > 0]
+    if not points:
+        return 0.0, 1.0
+    if len(points) == 1:
+        x, y = points[0]
+        return math.exp(y - x), 1.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        alpha = 1.0
+    else:
+        alpha = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+    alpha = min(max(alpha, 0.5), 2.0)
+    return math.exp(mean_y - alpha * mean_x), alpha
+
+def plan_slices(amount, full_impact_bps, curve, min_slice_amount):
+    k, alpha = curve
+    max_count = max(1, min(MAX_SLICES, amount // min_slice_amount))
+    best_count, best_cost = 1, full_impact_bps
+    for count in range(2, max_count + 1):
+        cost = k * (amount / count) ** alpha + (count - 1) * SLICE_OVERHEAD_BPS
+        if cost < best_cost:
+            best_count, best_cost = count, cost
+    if full_impact_bps - best_cost < MIN_SLICE_SAVINGS_BPS:
+        return [amount]
+    base = amount // best_count
+    return [base] * (best_count - 1) + [amount - base * (best_count - 1)]
+
+def send_swap_transaction(quote_response):
+    swap_data = get_jupiter_swap_transaction(quote_response, wallet.pubkey())
+    tx_base64 = swap_data.get("swapTransaction")
+    if not tx_base64:
+        log("Swap transaction missing from Jupiter response.")
+        return None
+
+    tx_bytes = base64.b64decode(tx_base64)
+    transaction = Transaction.deserialize(tx_bytes)
+
+    blockhash = get_latest_blockhash_with_retry()
+    if not blockhash:
+        log("No valid blockhash. Aborting swap.")
+        return None
+
+    message = Message.new_with_blockhash(
+        instructions=transaction.message.instructions,
+        payer=wallet.pubkey(),
+        blockhash=blockhash
+    )
+    new_tx = Transaction.populate(message, transaction.signatures)
+    new_tx.fee_payer = wallet.pubkey()
+    new_tx.sign([wallet])
+
+    opts = TxOpts(skip_preflight=False, preflight_commitment="confirmed")
+    send_resp = solana_client.send_transaction(new_tx, opts=opts)
+    txid = send_resp.value if hasattr(send_resp, 'value') else send_resp.get('result')
+    if not txid:
+        log(f"❌ Swap failed to send. Full response: {send_resp}")
+        return None
+    return txid
+
+def confirm_swap_transaction(txid):
+    try:
+        signature = txid if isinstance(txid, Signature) else Signature.from_string(str(txid))
+        resp = solana_client.confirm_transaction(signature, commitment="confirmed")
+        statuses = resp.value if hasattr(resp, 'value') else None
+        if not statuses or statuses[0] is None:
+            log(f"Confirmation failed for {txid}: no signature status returned")
+            return False
+        if statuses[0].err:
+            log(f"Confirmation failed for {txid}: transaction failed on chain: {statuses[0].err}")
+            return False
+        return True
+    except Exception as e:
+        log(f"Confirmation failed for {txid}: {e}")
+        return False
 
-        tx_base64 = swap_data.get("swapTransaction")
-        if not tx_base64:
-            log("Swap transaction missing from Jupiter response.")
-            return
+def fetch_received_amount(txid, output_mint):
+    # Actual output of a confirmed swap, from the wallet's pre/post balances in the transaction meta
+    try:
+        signature = txid if isinstance(txid, Signature) else Signature.from_string(str(txid))
+        resp = solana_client.get_transaction(signature, commitment="confirmed", max_supported_transaction_version=0)
+        meta = resp.value.transaction.meta if hasattr(resp, 'value') and resp.value else None
+        if meta is None:
+            return None
+        if output_mint == SOL_MINT:
+            # Fee payer is account 0; add the fee back so only the swap output remains
+            return meta.post_balances[0] - meta.pre_balances[0] + meta.fee
+        owner = wallet.pubkey()
+        def token_amount(balances):
+            return sum(int(balance.ui_token_amount.amount) for balance in balances or []
+                       if str(balance.mint) == output_mint and balance.owner == owner)
+        return token_amount(meta.post_token_balances) - token_amount(meta.pre_token_balances)
+    except Exception as e:
+        log(f"Failed to read received amount for {txid}: {e}")
+        return None
 
-        # Step 2: Decode and prepare transaction
-        tx_bytes = base64.b64decode(tx_base64)
-        transaction = Transaction.deserialize(tx_bytes)
+def send_and_confirm_swap(quote_response):
+    try:
+        txid = send_swap_transaction(quote_response)
+        if txid and confirm_swap_transaction(txid):
+            log(f"✅ Swap confirmed! TXID: {txid}")
+            return txid
+    except Exception as e:
+        log(f"Swap execution error: {e}\nTraceback: {traceback.format_exc()}")
+    return None
 
-        blockhash = get_latest_blockhash_with_retry()
-        if not blockhash:
-            log("No valid blockhash. Aborting swap.")
-            return
+def execute_slices(slice_amounts, input_mint, output_mint):
+    # Quote slice N while slice N-1 is still confirming in the sender thread
+    filled = []
+    in_flight = None
+    with ThreadPoolExecutor(max_workers=1) as sender:
+        for index, slice_amount in enumerate(slice_amounts):
+            if index > 0:
+                time.sleep(SLICE_INTERVAL_SECONDS)
+            quote = get_jupiter_quote(slice_amount, input_mint, output_mint, log_quote=False) if is_running else None
+            if in_flight is not None:
+                prev_quote, future = in_flight
+                in_flight = None
+                txid = future.result()
+                if txid:
+                    filled.append((prev_quote, txid))
+                else:
+                    log(f"Slice {index}/{len(slice_amounts)} failed. Remaining slices cancelled.")
+                    break
+            if quote is None:
+                log(f"No quote for slice {index + 1}/{len(slice_amounts)} (or bot stopped). Remaining slices cancelled.")
+                break
+            log(f"Slice {index + 1}/{len(slice_amounts)}: {slice_amount} {MINT_SYMBOLS.get(input_mint, input_mint)} -> {quote['outAmount']} {MINT_SYMBOLS.get(output_mint, output_mint)}, impact {parse_price_impact_bps(quote):.2f} bps")
+            in_flight = (quote, sender.submit(send_and_confirm_swap, quote))
+        if in_flight is not None:
+            txid = in_flight[1].result()
+            if txid:
+                filled.append((in_flight[0], txid))
+    return filled
+
+def execute_sized_swap(amount, input_mint=SOL_MINT, output_mint=USDC_MINT):
+    """Swap `amount` base units, splitting into timed slices when the quoted price impact makes that cheaper.
+
+    Returns the filled input amount in base units (0 when nothing was swapped).
+    """
+    global current_asset, swap_in_progress, usdc_holdings
+    if swap_in_progress:
+        log("Swap already in progress. Skipping.")
+        return 0
 
-        message = Message.new_with_blockhash(
-            instructions=transaction.message.instructions,
-            payer=wallet.pubkey(),
-            blockhash=blockhash
-        )
-        new_tx = Transaction.populate(message, transaction.signatures)
-        new_tx.fee_payer = wallet.pubkey()
-        new_tx.sign([wallet])
-
-        # Step 3: Send transaction
-        opts = TxOpts(skip_preflight=False, preflight_commitment="confirmed")
-        send_resp = solana_client.send_transaction(new_tx, opts=opts)
-
-        # Step 4: Confirm result
-        if "result" in send_resp:
-            txid = send_resp["result"]
-            log(f"✅ Swap executed! TXID: {txid}")
-            send_telegram(f"🔄 Swap complete\nTX: https://solscan.io/tx/{txid}")
-            current_asset = "USDC"
+    swap_in_progress = True
+    try:
+        if amount < 2 * MIN_SLICE_AMOUNTS.get(input_mint, 1):
+            # Too small to split: skip the impact probes and swap on a single quote
+            full_quote = get_jupiter_quote(amount, input_mint, output_mint)
+            slice_amounts = [amount]
+        else:
+            log(f"Probing price impact for {amount} {MINT_SYMBOLS.get(input_mint, input_mint)} → {MINT_SYMBOLS.get(output_mint, output_mint)}")
+            samples = probe_price_impact(amount, input_mint, output_mint)
+            full_quote = next((quote for size, _, quote in samples if size == amount), None)
+            if full_quote:
+                curve = fit_price_impact_curve(samples)
+                full_impact_bps = parse_price_impact_bps(full_quote)
+                slice_amounts = plan_slices(amount, full_impact_bps, curve, MIN_SLICE_AMOUNTS.get(input_mint, 1))
+                log(f"Impact curve: k={curve[0]:.3e}, alpha={curve[1]:.2f}; full-size impact {full_impact_bps:.2f} bps → {len(slice_amounts)} slice(s)")
+        if not full_quote:
+            log("⚠️ Failed to get Jupiter quote for full size. Swap aborted.")
+            return 0
+
+        if len(slice_amounts) == 1:
+            txid = send_and_confirm_swap(full_quote)
+            filled = [(full_quote, txid)] if txid else []
         else:
-            log(f"❌ Swap failed to send. Full response: {send_resp}")
-            send_telegram(f"[ERROR] Swap failed: {send_resp}")
+            filled = execute_slices(slice_amounts, input_mint, output_mint)
+
+        filled_in = sum(int(quote['inAmount']) for quote, _ in filled)
+        filled_out = 0
+        for quote, txid in filled:
+            received = fetch_received_amount(txid, output_mint)
+            filled_out += received if received is not None else int(quote['otherAmountThreshold'])
+        if not filled_in:
+            send_telegram("[ERROR] Swap failed: no slices filled.")
+            return 0
+
+        if output_mint == USDC_MINT:
+            usdc_holdings += filled_out
+        else:
+            usdc_holdings = max(0, usdc_holdings - filled_in)
+        # Stay in USDC while any is left unsold so the rebuy check still covers it
+        current_asset = "USDC" if usdc_holdings > 0 else "SOL"
+
+        status = "complete" if filled_in == amount else "partial"
+        log(f"Swap {status}: filled {filled_in}/{amount} across {len(filled)}/{len(slice_amounts)} slice(s), received {filled_out}")
+        tx_links = "\n".join(f"TX: https://solscan.io/tx/{txid}" for _, txid in filled)
+        send_telegram(f"🔄 Swap {status}\nFilled {filled_in}/{amount} in {len(filled)}/{len(slice_amounts)} slice(s)\nReceived: {filled_out}\n{tx_links}")
+        return filled_in
 
     except Exception as e:
         log(f"Swap execution error: {e}")
         send_telegram(f"[ERROR] Swap error: {e}")
+        return 0
     finally:
         swap_in_progress = False
 
 
-def execute_reverse_swap():
-    global current_asset, swap_in_progress
-    if swap_in_progress:
-        log("Reverse swap already in progress. Skipping.")
-        return
-    swap_in_progress = True
-    try:
-        usdc_amount = 10  # USD value to swap, you can adjust this
-        log(f"Attempting to reverse swap: {usdc_amount} USDC → SOL")
-
-        # Step 1: Convert to smallest unit
-        amount_usdc_lamports = int(usdc_amount * 1e6)
-
-        # Step 2: Get Jupiter quote (USDC → SOL)
-        url = 'https://quote-api.jup.ag/v6/quote'
-        params = {
-            'inputMint': 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v',  # USDC
-            'outputMint': 'So11111111111111111111111111111111111111112',  # SOL
-            'amount': str(amount_usdc_lamports),
-            'slippageBps': '50',
-            'asLegacyRoute': 'true',
-            'onlyDirectRoutes': 'false'
-        }
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        quote = response.json()
-
-        if 'outAmount' not in quote:
-            log("Invalid quote data for reverse swap.")
-            return
-
-        log(f"Reverse quote received: {quote}")
+def execute_swap(amount_lamports):
+    global position_open
+    if not execute_sized_swap(amount_lamports, SOL_MINT, USDC_MINT):
+        log("⚠️ Swap aborted.")
+        position_open = False
 
-        # Step 3: Get swap transaction
-        swap_payload = {
-            'quoteResponse': quote,
-            'userPublicKey': str(wallet.pubkey()),
-            'wrapAndUnwrapSol': True,
-            'asLegacyTransaction': True
-        }
-        swap_resp = requests.post('https://quote-api.jup.ag/v6/swap', json=swap_payload)
-        swap_resp.raise_for_status()
-        swap_tx_data = swap_resp.json()
-        tx_bytes = base64.b64decode(swap_tx_data['swapTransaction'])
-        transaction = Transaction.from_bytes(tx_bytes)
-
-        blockhash = get_latest_blockhash_with_retry()
-        if not blockhash:
-            log("No blockhash for reverse swap.")
-            return
 
-        new_msg = Message.new_with_blockhash(
-            instructions=transaction.message.instructions,
-            payer=wallet.pubkey(),
-            blockhash=blockhash
-        )
-        new_tx = Transaction.populate(new_msg, transaction.signatures)
-        new_tx.fee_payer = wallet.pubkey()
-        new_tx.sign([wallet])
-
-        opts = TxOpts(skip_preflight=False, preflight_commitment="confirmed")
-        tx_result = solana_client.send_transaction(new_tx, opts=opts)
-        txid = tx_result.get('result')
-
-        if txid:
-            log(f"Reverse swap TXID: {txid}")
-            send_telegram(f"🔁 Reversed to SOL\nTX: https://solscan.io/tx/{txid}")
-            current_asset = "SOL"
-        else:
-            log(f"Reverse swap failed: {tx_result}")
-            send_telegram(f"[ERROR] Reverse swap failed.")
-
-    except Exception as e:
-        log(f"Reverse swap error: {e}")
-        send_telegram(f"[ERROR] Reverse swap error: {e}")
-    finally:
-        swap_in_progress = False
+def execute_reverse_swap():
+    usdc_amount = usdc_holdings or int(REVERSE_SWAP_USDC_AMOUNT * 1e6)
+    log(f"Attempting to reverse swap: {usdc_amount / 1e6:.6f} USDC → SOL")
+    if execute_sized_swap(usdc_amount, USDC_MINT, SOL_MINT):
+        send_telegram("🔁 Reversed to SOL")
 
 def bot_loop():
     global is_running, position_open, entry_price, buy_price, stop_loss_price, take_profit_price
@@ -615,19 +773,9 @@ def bot_loop():
                 send_telegram(f"\U0001F7E2 BUY at ${buy_price:.2f}")
                 play_sound("buy_alert.wav")
 
-                quote = get_jupiter_quote(
-                    input_mint=SOL_MINT,
-                    output_mint=USDC_MINT,
-                    amount=int(trade_amount * LAMPORTS_PER_SOL)
-                )
-                if not quote:
-                    log("⚠️ Failed to get Jupiter quote. Swap aborted.")
-                    position_open = False
-                    continue
-
                 threading.Thread(
                     target=execute_swap,
-                    args=(quote, wallet, solana_client),
+                    args=(int(trade_amount * LAMPORTS_PER_SOL),),
                     daemon=True
                 ).start()
                 continue
@@ -718,4 +866,5 @@ canvas = FigureCanvasTkAgg(fig, master=main_frame)
 canvas.draw()
 canvas.get_tk_widget().grid(row=7, column=0, columnspan=2)
 
+root.after(UI_FRAME_MS, drain_ui_events)
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,523 @@
+import argparse
+import ast
+import csv
+import glob
+import gzip
+import json
+import os
+import re
+import sys
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+
+# --- Configuration ---
+SOL_MINT = "So11111111111111111111111111111111111111112"
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+CHUNK_SIZE = 8 * 1024 * 1024  # Plain-text logs larger than this are split across worker processes
+LATENCY_PAIRS = [
+    ("buy", "quote"),
+    ("quote", "swap_request"),
+    ("quote", "blockhash"),
+    ("quote", "swap_sent"),
+    ("swap_request", "swap_sent"),
+]
+
+# Matches the bot's "%(asctime)s - %(levelname)s - %(message)s" format
+RECORD_RE = re.compile(rb"^(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d),(\d{3}) - ([A-Z]+) - ")
+FRAME_RE = re.compile(r'^\s*File "(?P<file>[^"]+)", line \d+, in (?P<func>\S+)')
+EXCEPTION_RE = re.compile(r"^(?P<type>[A-Za-z_][\w.]*(?:Error|Exception|Exit|Interrupt))(?::|$)")
+PRICE_RE = re.compile(r"^Current Price: \$(?P<price>[\d.]+)")
+TRADE_RE = re.compile(r"^(?P<kind>BUY at|STOP-LOSS Triggered at|TAKE-PROFIT Triggered at) \$(?P<price>[\d.]+)")
+TXID_RE = re.compile(r"TXID: (?P<txid>\w+)")
+# "Impact probe: 1250000 SOL -> 215466 USDC, impact 0.00 bps" / "Slice 2/4: ..." quote summaries
+QUOTE_LINE_RE = re.compile(r"^(?:Impact probe|Slice \d+/\d+): (?P<in>\d+) (?P<input>\w+) -> (?P<out>\d+) (?P<output>\w+), impact (?P<bps>[\d.]+) bps")
+HTTP_RE = re.compile(r'^HTTP Request: (?P<method>\w+) \S+ "HTTP/[\d.]+ (?P<status>\d{3})')
+
+SYMBOL_MINTS = {"SOL": SOL_MINT, "USDC": USDC_MINT}
+
+# Message prefix -> (event kind, bot function). Kinds ending in "_error" are failed calls;
+# "attempt_error" marks a single failed retry attempt and does not count as a failed call.
+# Swap send/confirm outcomes are grouped under send_and_confirm_swap; execute_swap only
+# appears for logs written before the sized execution engine.
+MESSAGE_KINDS = [
+    ("Quote received: ", "quote", "get_jupiter_quote"),
+    ("Sending payload to /v6/swap", "swap_request", "get_jupiter_swap_transaction"),
+    ("Successfully fetched blockhash", "blockhash", "get_latest_blockhash_with_retry"),
+    ("✅ Swap executed!", "swap_sent", "execute_swap"),
+    ("✅ Swap confirmed!", "swap_sent", "send_and_confirm_swap"),
+    ("Swap complete: ", "swap_filled", "execute_sized_swap"),
+    ("Swap partial: ", "swap_filled", "execute_sized_swap"),
+    ("Reverse swap TXID", "swap_sent", "execute_reverse_swap"),
+    ("Price fetch attempt", "attempt_error", "fetch_current_price"),
+    ("Max attempts reached for price fetch", "fetch_error", "fetch_current_price"),
+    ("Failed to fetch price", "fetch_error", "fetch_current_price"),
+    ("Balance fetch attempt", "attempt_error", "fetch_wallet_balance"),
+    ("Failed to fetch balance", "fetch_error", "fetch_wallet_balance"),
+    ("Blockhash fetch attempt", "attempt_error", "get_latest_blockhash_with_retry"),
+    ("Rate limit hit.", "fetch_error", "get_latest_blockhash_with_retry"),
+    ("Failed to fetch blockhash", "fetch_error", "get_latest_blockhash_with_retry"),
+    ("Invalid blockhash response", "fetch_error", "get_latest_blockhash_with_retry"),
+    ("Quote fetch attempt", "attempt_error", "get_jupiter_quote"),
+    ("Quote API HTTP error", "attempt_error", "get_jupiter_quote"),
+    ("Invalid quote response", "fetch_error", "get_jupiter_quote"),
+    ("Failed to get quote", "fetch_error", "get_jupiter_quote"),
+    ("Swap API HTTP error", "swap_error", "get_jupiter_swap_transaction"),
+    ("Invalid swap transaction response", "swap_error", "get_jupiter_swap_transaction"),
+    ("Unexpected error in get_jupiter_swap_transaction", "swap_error", "get_jupiter_swap_transaction"),
+    ("Swap execution error", "swap_error", "execute_sized_swap"),
+    ("Swap error", "swap_error", "execute_swap"),
+    ("❌ Swap failed to send", "swap_error", "send_and_confirm_swap"),
+    ("No valid blockhash. Aborting swap", "swap_error", "send_and_confirm_swap"),
+    ("Swap transaction missing from Jupiter response", "swap_error", "send_and_confirm_swap"),
+    ("⚠️ Failed to get Jupiter quote", "swap_error", "execute_sized_swap"),
+    ("No quote for slice", "swap_error", "execute_slices"),
+    ("Failed to read received amount", "fetch_error", "fetch_received_amount"),
+    ("Reverse swap error", "swap_error", "execute_reverse_swap"),
+    ("Reverse swap failed", "swap_error", "execute_reverse_swap"),
+    ("Confirmation failed", "swap_error", "send_and_confirm_swap"),
+    ("Bot loop error", "loop_error", "bot_loop"),
+    ("Telegram error", "telegram_error", "send_telegram"),
+    ("Sound playback error", "sound_error", "play_sound"),
+    ("RPC endpoint validation failed", "rpc_error", "validate_rpc_endpoint"),
+]
+SUCCESS_KINDS = {"quote", "blockhash", "swap_sent", "swap_filled", "price"}
+
+Event = namedtuple("Event", ["timestamp", "level", "kind", "function", "message", "traceback", "data"])
+
+
+def parse_timestamp(match):
+    year, month, day, hour, minute, second, millis = (int(group) for group in match.groups()[:7])
+    return datetime(year, month, day, hour, minute, second, millis * 1000)
+
+
+def reporting_bot_frame(traceback_lines):
+    """Function that caught and logged the exception: the outermost bot frame of the last traceback."""
+    starts = [index for index, line in enumerate(traceback_lines) if line.startswith("Traceback (most recent call last)")]
+    for line in traceback_lines[starts[-1] if starts else 0:]:
+        frame = FRAME_RE.match(line)
+        if frame and os.path.basename(frame.group("file").replace("\\", "/")).startswith("jupbot"):
+            return frame.group("func")
+    return None
+
+
+def exception_type(traceback_lines):
+    for line in reversed(traceback_lines):
+        match = EXCEPTION_RE.match(line)
+        if match:
+            return match.group("type")
+    return None
+
+
+def parse_quote(message):
+    try:
+        quote = ast.literal_eval(message[len("Quote received: "):])
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+    return quote if isinstance(quote, dict) else None
+
+
+def classify(timestamp, level, message, traceback_lines):
+    """Turn one log record (first line plus continuation lines) into an Event."""
+    kind, function, data = "info", None, None
+    for prefix, prefix_kind, prefix_function in MESSAGE_KINDS:
+        if message.startswith(prefix):
+            kind, function = prefix_kind, prefix_function
+            break
+    else:
+        quote_line = QUOTE_LINE_RE.match(message)
+        price = PRICE_RE.match(message)
+        trade = TRADE_RE.match(message)
+        http = HTTP_RE.match(message)
+        if quote_line:
+            kind, function, data = "quote", "get_jupiter_quote", {
+                "inputMint": SYMBOL_MINTS.get(quote_line.group("input")),
+                "outputMint": SYMBOL_MINTS.get(quote_line.group("output")),
+                "inAmount": quote_line.group("in"),
+                "outAmount": quote_line.group("out"),
+                "priceImpactPct": float(quote_line.group("bps")) / 10_000,
+            }
+        elif message.startswith("Slice ") and " failed" in message:
+            kind, function = "swap_error", "execute_slices"
+        elif price:
+            kind, function, data = "price", "fetch_current_price", float(price.group("price"))
+        elif trade:
+            kind = {"BUY at": "buy", "STOP-LOSS Triggered at": "stop_loss", "TAKE-PROFIT Triggered at": "take_profit"}[trade.group("kind")]
+            data = float(trade.group("price"))
+        elif http:
+            kind, data = "http", int(http.group("status"))
+        elif level in ("ERROR", "CRITICAL"):
+            kind = "error"
+
+    if kind == "quote" and message.startswith("Quote received: "):
+        data = parse_quote(message)
+    elif kind == "swap_sent":
+        txid = TXID_RE.search(message)
+        data = txid.group("txid") if txid else None
+
+    if traceback_lines:
+        function = reporting_bot_frame(traceback_lines) or function
+        if kind not in SUCCESS_KINDS and not kind.endswith("_error"):
+            kind = "error"
+    return Event(timestamp, level, kind, function, message, traceback_lines, data)
+
+
+def iter_records(stream, end=None):
+    """Yield Events from a binary stream, grouping continuation lines with their record.
+
+    With `end` set, stops at the first record that starts at or after that byte offset.
+    """
+    header, first_line, continuation = None, None, []
+    while True:
+        offset = stream.tell() if end is not None else None
+        raw = stream.readline()
+        if not raw:
+            break
+        match = RECORD_RE.match(raw)
+        if match:
+            if header is not None:
+                yield classify(parse_timestamp(header), header.group(8).decode(), first_line, continuation)
+            if end is not None and offset >= end:
+                header = None
+                break
+            header = match
+            first_line = raw[match.end():].decode("utf-8", errors="replace").rstrip("\r\n")
+            continuation = []
+        elif header is not None:
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if line.startswith("Traceback: "):
+                line = line[len("Traceback: "):]
+            if line.strip():
+                continuation.append(line)
+    if header is not None:
+        yield classify(parse_timestamp(header), header.group(8).decode(), first_line, continuation)
+
+
+def seek_to_record(stream, start):
+    """Position `stream` at the first record starting at or after `start`."""
+    if start == 0:
+        return
+    stream.seek(start - 1)
+    stream.readline()  # finish the line that straddles `start`
+    while True:
+        offset = stream.tell()
+        raw = stream.readline()
+        if not raw or RECORD_RE.match(raw):
+            stream.seek(offset)
+            return
+
+
+def quote_row(quote):
+    row = {
+        "input": quote.get("inputMint"),
+        "output": quote.get("outputMint"),
+        "in": int(quote.get("inAmount") or 0),
+        "out": int(quote.get("outAmount") or 0),
+        "price_impact_pct": float(quote.get("priceImpactPct") or 0),
+        "implied_price": None,
+    }
+    if row["in"] and row["out"]:
+        if row["input"] == SOL_MINT and row["output"] == USDC_MINT:
+            row["implied_price"] = (row["out"] / 1e6) / (row["in"] / 1e9)
+        elif row["input"] == USDC_MINT and row["output"] == SOL_MINT:
+            row["implied_price"] = (row["in"] / 1e6) / (row["out"] / 1e9)
+    return row
+
+
+def new_summary():
+    return {
+        "records": 0,
+        "first": None,
+        "last": None,
+        "levels": Counter(),
+        "kinds": Counter(),
+        "errors": Counter(),
+        "attempt_errors": Counter(),
+        "successes": Counter(),
+        "exceptions": Counter(),
+        "http_status": Counter(),
+        "markers": [],
+        "trades": [],
+        "quotes": [],
+        "prices": {},
+    }
+
+
+def add_event(summary, event):
+    summary["records"] += 1
+    if summary["first"] is None or event.timestamp < summary["first"]:
+        summary["first"] = event.timestamp
+    if summary["last"] is None or event.timestamp > summary["last"]:
+        summary["last"] = event.timestamp
+    summary["levels"][event.level] += 1
+    summary["kinds"][event.kind] += 1
+
+    if event.kind == "attempt_error":
+        summary["attempt_errors"][event.function or "unknown"] += 1
+    elif event.kind.endswith("_error") or event.kind == "error":
+        summary["errors"][event.function or "unknown"] += 1
+    elif event.kind in SUCCESS_KINDS and event.function:
+        summary["successes"][event.function] += 1
+    if event.traceback:
+        summary["exceptions"][exception_type(event.traceback) or "unknown"] += 1
+
+    if event.kind == "http":
+        summary["http_status"][event.data] += 1
+    elif event.kind == "price":
+        # One OHLC bucket per minute keeps the price series bounded by time span, not log size
+        minute = event.timestamp.replace(second=0, microsecond=0)
+        bucket = summary["prices"].get(minute)
+        if bucket is None:
+            summary["prices"][minute] = [event.timestamp, event.data, event.data, event.data, event.timestamp, event.data, 1]
+        else:
+            if event.timestamp < bucket[0]:
+                bucket[0], bucket[1] = event.timestamp, event.data
+            bucket[2] = max(bucket[2], event.data)
+            bucket[3] = min(bucket[3], event.data)
+            if event.timestamp >= bucket[4]:
+                bucket[4], bucket[5] = event.timestamp, event.data
+            bucket[6] += 1
+    elif event.kind in ("buy", "stop_loss", "take_profit"):
+        summary["trades"].append((event.timestamp, event.kind, event.data))
+    elif event.kind == "swap_sent":
+        summary["trades"].append((event.timestamp, event.kind, event.data))
+    elif event.kind == "quote" and event.data:
+        summary["quotes"].append((event.timestamp, quote_row(event.data)))
+
+    if any(event.kind in pair for pair in LATENCY_PAIRS):
+        summary["markers"].append((event.timestamp, event.kind))
+
+
+def merge_summaries(summaries):
+    merged = new_summary()
+    for summary in summaries:
+        merged["records"] += summary["records"]
+        for bound, pick in (("first", min), ("last", max)):
+            values = [value for value in (merged[bound], summary[bound]) if value is not None]
+            merged[bound] = pick(values) if values else None
+        for key in ("levels", "kinds", "errors", "attempt_errors", "successes", "exceptions", "http_status"):
+            merged[key].update(summary[key])
+        merged["markers"].extend(summary["markers"])
+        merged["trades"].extend(summary["trades"])
+        merged["quotes"].extend(summary["quotes"])
+        for minute, bucket in summary["prices"].items():
+            current = merged["prices"].get(minute)
+            if current is None:
+                merged["prices"][minute] = list(bucket)
+                continue
+            if bucket[0] < current[0]:
+                current[0], current[1] = bucket[0], bucket[1]
+            current[2] = max(current[2], bucket[2])
+            current[3] = min(current[3], bucket[3])
+            if bucket[4] >= current[4]:
+                current[4], current[5] = bucket[4], bucket[5]
+            current[6] += bucket[6]
+    merged["markers"].sort()
+    merged["trades"].sort()
+    merged["quotes"].sort(key=lambda quote: quote[0])
+    return merged
+
+
+def open_log(path):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def analyze_chunk(task):
+    path, start, end = task
+    summary = new_summary()
+    with open_log(path) as stream:
+        seek_to_record(stream, start)
+        for event in iter_records(stream, end):
+            add_event(summary, event)
+    return summary
+
+
+def plan_chunks(paths, chunk_size=CHUNK_SIZE):
+    tasks = []
+    for path in paths:
+        if path.endswith(".gz"):
+            tasks.append((path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        if size <= chunk_size:
+            tasks.append((path, 0, None))
+            continue
+        for start in range(0, size, chunk_size):
+            end = start + chunk_size
+            tasks.append((path, start, end if end < size else None))
+    return tasks
+
+
+def analyze(paths, jobs=None, chunk_size=CHUNK_SIZE):
+    tasks = plan_chunks(paths, chunk_size)
+    if jobs == 1 or len(tasks) == 1:
+        return merge_summaries(analyze_chunk(task) for task in tasks)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return merge_summaries(pool.map(analyze_chunk, tasks))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def latency_report(markers):
+    """Pair each end event with the latest unpaired start event before it."""
+    report = {}
+    for start_kind, end_kind in LATENCY_PAIRS:
+        pending = None
+        samples = []
+        for timestamp, kind in markers:
+            if kind == start_kind:
+                pending = timestamp
+            elif kind == end_kind and pending is not None:
+                samples.append((timestamp - pending).total_seconds())
+                pending = None
+        samples.sort()
+        report[f"{start_kind} -> {end_kind}"] = {
+            "count": len(samples),
+            "min": samples[0] if samples else None,
+            "p50": percentile(samples, 0.5),
+            "p90": percentile(samples, 0.9),
+            "p99": percentile(samples, 0.99),
+            "max": samples[-1] if samples else None,
+        }
+    return report
+
+
+def error_report(summary):
+    hours = (summary["last"] - summary["first"]).total_seconds() / 3600 if summary["records"] else 0
+    report = {}
+    for function in sorted(set(summary["errors"]) | set(summary["attempt_errors"]) | set(summary["successes"])):
+        errors = summary["errors"][function]
+        successes = summary["successes"][function]
+        report[function] = {
+            "errors": errors,
+            "failed_attempts": summary["attempt_errors"][function],
+            "successes": successes,
+            "failure_ratio": errors / (errors + successes) if errors + successes else None,
+            "errors_per_hour": errors / hours if hours else None,
+        }
+    return report
+
+
+def price_series(summary):
+    return [
+        {"minute": minute.isoformat(), "open": bucket[1], "high": bucket[2], "low": bucket[3], "close": bucket[5], "samples": bucket[6]}
+        for minute, bucket in sorted(summary["prices"].items())
+    ]
+
+
+def build_report(summary):
+    series = price_series(summary)
+    return {
+        "records": summary["records"],
+        "first": summary["first"].isoformat() if summary["first"] else None,
+        "last": summary["last"].isoformat() if summary["last"] else None,
+        "levels": dict(summary["levels"]),
+        "events": dict(summary["kinds"]),
+        "http_status": {str(status): count for status, count in summary["http_status"].items()},
+        "errors_by_function": error_report(summary),
+        "exceptions": dict(summary["exceptions"].most_common()),
+        "latency_seconds": latency_report(summary["markers"]),
+        "trades": [{"time": timestamp.isoformat(), "event": kind, "value": value} for timestamp, kind, value in summary["trades"]],
+        "quotes": [dict(row, time=timestamp.isoformat()) for timestamp, row in summary["quotes"]],
+        "price": {
+            "minutes": len(series),
+            "low": min((row["low"] for row in series), default=None),
+            "high": max((row["high"] for row in series), default=None),
+            "first": series[0]["open"] if series else None,
+            "last": series[-1]["close"] if series else None,
+        },
+    }
+
+
+def format_seconds(value):
+    return "-" if value is None else f"{value:.3f}s"
+
+
+def print_report(report):
+    print(f"Records: {report['records']}  ({report['first']} → {report['last']})")
+    print("Levels: " + ", ".join(f"{level}={count}" for level, count in sorted(report["levels"].items())))
+    print("HTTP status: " + (", ".join(f"{status}={count}" for status, count in sorted(report["http_status"].items())) or "-"))
+
+    print("\nErrors by function:")
+    print(f"  {'function':<34}{'errors':>8}{'retries':>9}{'ok':>8}{'fail %':>9}{'err/h':>9}")
+    for function, row in sorted(report["errors_by_function"].items(), key=lambda item: -item[1]["errors"]):
+        ratio = "-" if row["failure_ratio"] is None else f"{row['failure_ratio'] * 100:.1f}"
+        per_hour = "-" if row["errors_per_hour"] is None else f"{row['errors_per_hour']:.2f}"
+        print(f"  {function:<34}{row['errors']:>8}{row['failed_attempts']:>9}{row['successes']:>8}{ratio:>9}{per_hour:>9}")
+
+    if report["exceptions"]:
+        print("\nExceptions:")
+        for name, count in report["exceptions"].items():
+            print(f"  {count:>6}  {name}")
+
+    print("\nLatency between events:")
+    print(f"  {'pair':<30}{'n':>6}{'min':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for pair, row in report["latency_seconds"].items():
+        print(f"  {pair:<30}{row['count']:>6}" + "".join(f"{format_seconds(row[key]):>10}" for key in ("min", "p50", "p90", "p99", "max")))
+
+    price = report["price"]
+    print("\nPrice:")
+    if price["minutes"]:
+        print(f"  {price['minutes']} minute(s), first ${price['first']:.2f}, last ${price['last']:.2f}, low ${price['low']:.2f}, high ${price['high']:.2f}")
+    else:
+        print("  no price records")
+
+    implied = [quote["implied_price"] for quote in report["quotes"] if quote["implied_price"]]
+    if implied:
+        print(f"  {len(implied)} quote(s), implied price ${min(implied):.2f}–${max(implied):.2f}, "
+              f"max impact {max(quote['price_impact_pct'] for quote in report['quotes']) * 100:.4f}%")
+
+    trade_counts = Counter(trade["event"] for trade in report["trades"])
+    print("\nTrades: " + (", ".join(f"{kind}={count}" for kind, count in sorted(trade_counts.items())) or "-"))
+
+
+def write_price_csv(summary, path):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=["minute", "open", "high", "low", "close", "samples"])
+        writer.writeheader()
+        writer.writerows(price_series(summary))
+
+
+def expand_paths(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or [pattern]
+        paths.extend(match for match in matches if match not in paths)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize jupbot.log: error rates, event latencies, prices and trades.")
+    parser.add_argument("logs", nargs="*", default=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "jupbot.log")],
+                        help="Log files or globs, e.g. 'jupbot.log*' for rotated logs (.gz supported)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Worker processes for large logs (default: all cores)")
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_SIZE / (1024 * 1024), help="Chunk size per worker in MB")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--prices-csv", metavar="PATH", help="Write the per-minute OHLC price series to a CSV file")
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.logs)
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        parser.error(f"Log file(s) not found: {', '.join(missing)}")
+
+    summary = analyze(paths, jobs=max(1, args.jobs), chunk_size=max(1, int(args.chunk_mb * 1024 * 1024)))
+    report = build_report(summary)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2, default=str)
+        print()
+    else:
+        print_report(report)
+    if args.prices_csv:
+        write_price_csv(summary, args.prices_csv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())